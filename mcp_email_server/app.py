@@ -1,3 +1,5 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from datetime import datetime
 from typing import Annotated, Literal
 
@@ -10,10 +12,28 @@ from mcp_email_server.config import (
     ProviderSettings,
     get_settings,
 )
+from mcp_email_server.emails.classic import close_connection_pools
 from mcp_email_server.emails.dispatcher import dispatch_handler
 from mcp_email_server.emails.models import EmailPageResponse
 
-mcp = FastMCP("email")
+# Number of sessions being served, with SSE each client connection runs the lifespan
+_sessions = 0
+
+
+@asynccontextmanager
+async def lifespan(server: FastMCP) -> AsyncIterator[None]:
+    # IMAP and SMTP connections are shared between sessions, close them after the last one
+    global _sessions
+    _sessions += 1
+    try:
+        yield
+    finally:
+        _sessions -= 1
+        if not _sessions:
+            await close_connection_pools()
+
+
+mcp = FastMCP("email", lifespan=lifespan)
 
 
 @mcp.resource("email://{account_name}")
@@ -93,6 +113,68 @@ async def page_email(
     )
 
 
+@mcp.tool(
+    description="List emails without their body or attachments, page start at 1, before and since as UTC datetime. "
+    "Use `page_email` to read the body."
+)
+async def list_emails(
+    account_name: Annotated[str, Field(description="The name of the email account.")],
+    page: Annotated[
+        int,
+        Field(default=1, description="The page number to retrieve (starting from 1)."),
+    ] = 1,
+    page_size: Annotated[int, Field(default=10, description="The number of emails to retrieve per page.")] = 10,
+    before: Annotated[
+        datetime | None,
+        Field(default=None, description="Retrieve emails before this datetime (UTC)."),
+    ] = None,
+    since: Annotated[
+        datetime | None,
+        Field(default=None, description="Retrieve emails since this datetime (UTC)."),
+    ] = None,
+    subject: Annotated[str | None, Field(default=None, description="Filter emails by subject.")] = None,
+    body: Annotated[str | None, Field(default=None, description="Filter emails by body.")] = None,
+    text: Annotated[str | None, Field(default=None, description="Filter emails by text.")] = None,
+    from_address: Annotated[str | None, Field(default=None, description="Filter emails by sender address.")] = None,
+    to_address: Annotated[
+        str | None,
+        Field(default=None, description="Filter emails by recipient address."),
+    ] = None,
+    order: Annotated[
+        Literal["asc", "desc"],
+        Field(default=None, description="Order emails by field. `asc` or `desc`."),
+    ] = "desc",
+    is_unread: Annotated[
+        bool | None,
+        Field(default=None, description="Filter emails by read status. True for unread, False for read, None for all."),
+    ] = None,
+    is_flagged: Annotated[
+        bool | None,
+        Field(
+            default=None,
+            description="Filter emails by flagged status. True for flagged, False for unflagged, None for all.",
+        ),
+    ] = None,
+) -> EmailPageResponse:
+    handler = dispatch_handler(account_name)
+
+    return await handler.get_emails(
+        page=page,
+        page_size=page_size,
+        before=before,
+        since=since,
+        subject=subject,
+        body=body,
+        text=text,
+        from_address=from_address,
+        to_address=to_address,
+        order=order,
+        is_unread=is_unread,
+        is_flagged=is_flagged,
+        headers_only=True,
+    )
+
+
 @mcp.tool(
     description="Send an email using the specified account. Recipient should be a list of email addresses.",
 )
@@ -27,6 +27,9 @@ class EmailServer(BaseModel):
     port: int
     use_ssl: bool = True  # Usually port 465
     start_ssl: bool = False  # Usually port 587
+    # IMAP only: sessions open at once per account, and emails requested per FETCH
+    max_connections: int = Field(default=3, ge=1)
+    fetch_batch_size: int = Field(default=50, ge=1, le=200)
 
     def masked(self) -> EmailServer:
         return self.model_copy(update={"password": "********"})
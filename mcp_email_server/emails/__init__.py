@@ -22,6 +22,7 @@ class EmailHandler(abc.ABC):
         order: str = "desc",
         is_unread: bool | None = None,
         is_flagged: bool | None = None,
+        headers_only: bool = False,
     ) -> "EmailPageResponse":
         """
         Get emails
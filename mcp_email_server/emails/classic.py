@@ -1,9 +1,24 @@
+import asyncio
 import email.utils
-from collections.abc import AsyncGenerator
-from datetime import datetime
+import itertools
+import multiprocessing
+import os
+import re
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import aclosing, asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from email.errors import HeaderParseError
+from email.header import decode_header
+from email.message import Message
 from email.mime.text import MIMEText
-from email.parser import BytesParser
-from email.policy import default
+from email.parser import BytesParser, HeaderParser
+from email.policy import compat32, default
+from functools import lru_cache
 from typing import Any
 
 import aioimaplib
@@ -14,76 +29,451 @@ from mcp_email_server.emails import EmailHandler
 from mcp_email_server.emails.models import EmailData, EmailPageResponse
 from mcp_email_server.log import logger
 
+# Servers reject over-long command lines ("maximum request size exceeded"), so never put
+# more than this many UIDs into a single UID FETCH.
+MAX_UIDS_PER_FETCH = 200
+
+# IMPORTANT: Use BODY.PEEK first to avoid marking messages as read
+FETCH_FORMATS = ("(BODY.PEEK[] FLAGS UID)", "BODY.PEEK[] FLAGS UID", "(BODY[] FLAGS UID)", "(RFC822 FLAGS UID)")
+# RFC822.HEADER doesn't set \Seen either, unlike BODY[HEADER...]
+HEADER_FETCH_FORMATS = (
+    "(BODY.PEEK[HEADER.FIELDS (SUBJECT FROM DATE MESSAGE-ID)] FLAGS UID)",
+    "(RFC822.HEADER FLAGS UID)",
+)
+
+FETCH_LINE_RE = re.compile(rb"^\d+ FETCH \(")
+UID_RE = re.compile(rb"UID (\d+)")
+FLAGS_RE = re.compile(rb"FLAGS \(([^)]*)\)")
+# One bit per IMAP system flag, so the flags of an email are looked up once each
+SEEN, ANSWERED, FLAGGED, DELETED, DRAFT, RECENT = (1 << bit for bit in range(6))
+FLAG_BITS = {
+    "\\Seen": SEEN,
+    "\\Answered": ANSWERED,
+    "\\Flagged": FLAGGED,
+    "\\Deleted": DELETED,
+    "\\Draft": DRAFT,
+    "\\Recent": RECENT,
+}
+ESEARCH_ALL_RE = re.compile(rb"\bALL ([0-9:,]+)")
+ESEARCH_COUNT_RE = re.compile(rb"\bCOUNT (\d+)")
+
+# The Date header including folded continuation lines, and the common "Mon, 1 Jan 2024 00:00:00 +0000" form
+DATE_HEADER_RE = re.compile(rb"^(?i:Date):[ \t]*((?:[^\r\n]|\r?\n[ \t])*)", re.MULTILINE)
+DATE_RE = re.compile(
+    rb"(?:[A-Za-z]{3},[ \t]*)?"
+    rb"(\d{1,2}) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) (\d{4}) (\d{2}):(\d{2}):(\d{2}) ([+-])(\d{2})(\d{2})"
+)
+MONTHS = {
+    month: number
+    for number, month in enumerate(
+        (b"Jan", b"Feb", b"Mar", b"Apr", b"May", b"Jun", b"Jul", b"Aug", b"Sep", b"Oct", b"Nov", b"Dec"), start=1
+    )
+}
+HEADER_END_RE = re.compile(rb"\r?\n\r?\n")
+FOLD_RE = re.compile(r"\r?\n(?=[ \t])")
+
+# Number of fetched batches allowed to wait for the consumer of get_emails_stream
+FETCH_PREFETCH_BATCHES = 2
+# Number of parsed emails allowed to wait for the consumer, and of emails parsed at once
+PARSE_QUEUE_SIZE = 16
+# Emails from this size on are parsed in a worker process, smaller ones aren't worth the IPC
+PROCESS_PARSE_MIN_SIZE = 8 * 1024
+
+# Idle SMTP connections older than this are closed rather than checked, servers and NATs
+# commonly drop them after 5 minutes and a NOOP on a silently dropped one only fails on timeout
+SMTP_IDLE_TIMEOUT = 4 * 60
+# Seconds a reused SMTP connection has to answer its NOOP
+SMTP_NOOP_TIMEOUT = 5
+
+# Created on first use, in a thread as starting the worker processes blocks
+_parse_pool: ProcessPoolExecutor | None = None
+_parse_pool_lock = threading.Lock()
+# Set when the workers can't run, e.g. __main__ can't be imported again. Big emails are then
+# parsed in threads for the rest of the process rather than starting a new pool for each one.
+_parse_pool_broken = False
+
+
+async def _logout(imap) -> None:
+    # Ensure we logout properly
+    try:
+        await imap.logout()
+    except Exception as e:
+        logger.info(f"Error during logout: {e}")
+
+
+async def _quit(smtp: aiosmtplib.SMTP) -> None:
+    try:
+        await smtp.quit()
+    except Exception as e:
+        logger.info(f"Error during SMTP quit: {e}")
+        smtp.close()
+
+
+async def _uid_esearch(
+    imap: aioimaplib.IMAP4_SSL, return_option: str, search_criteria: list[str]
+) -> aioimaplib.Response:
+    """Run ``UID SEARCH RETURN (<return_option>) <criteria>`` from RFC 4731 (ESEARCH).
+
+    aioimaplib has no API for it: ``uid_search()`` can't pass RETURN options, and the untagged
+    ``* ESEARCH`` answer is only handed to a pending command waiting for that name. So the
+    command is built like aioimaplib's own ``getquotaroot()`` does, with ``Command`` and the
+    protocol's ``new_tag()`` and ``execute()``. Those are internals, this is the only place
+    relying on them and they are checked against the aioimaplib versions allowed by
+    pyproject.toml.
+    """
+    protocol = imap.protocol
+    command = aioimaplib.Command(
+        "SEARCH",
+        protocol.new_tag(),
+        "RETURN",
+        f"({return_option})",
+        "CHARSET",
+        "utf-8",
+        *search_criteria,
+        prefix="UID",
+        untagged_resp_name="ESEARCH",
+        loop=protocol.loop,
+    )
+    return await asyncio.wait_for(protocol.execute(command), imap.timeout)
+
+
+def _decode_payload(part: Message) -> str:
+    payload = part.get_payload(decode=True)
+    if not payload:
+        return ""
+    charset = part.get_content_charset("utf-8")
+    try:
+        return payload.decode(charset)
+    except (LookupError, UnicodeDecodeError):
+        return payload.decode("utf-8", errors="replace")
+
+
+def _parse_date(raw_email: bytes | bytearray) -> datetime:
+    header_end = HEADER_END_RE.search(raw_email)
+    match = DATE_HEADER_RE.search(raw_email, 0, header_end.start() if header_end else len(raw_email))
+    date = _parse_date_header(bytes(match.group(1))) if match else None
+    return date if date is not None else datetime.now()
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_header(date_header: bytes) -> datetime | None:
+    """Parse the raw value of a Date header, cached as the same dates come up again in threads and lists."""
+    # Fast path: the common form is read straight from the bytes
+    match = DATE_RE.match(date_header)
+    if match:
+        day, month, year, hour, minute, second, sign, offset_hours, offset_minutes = match.groups()
+        offset = timedelta(hours=int(offset_hours), minutes=int(offset_minutes))
+        try:
+            date = datetime(
+                int(year),
+                MONTHS[month],
+                int(day),
+                int(hour),
+                int(minute),
+                int(second),
+                tzinfo=timezone(-offset if sign == b"-" else offset),
+            )
+            return date.astimezone().replace(tzinfo=None)
+        except ValueError:
+            pass
+
+    # Anything else goes through the lenient parser of the stdlib
+    try:
+        date_tuple = email.utils.parsedate_tz(date_header.decode("ascii", errors="replace"))
+        return datetime.fromtimestamp(email.utils.mktime_tz(date_tuple)) if date_tuple else None
+    except Exception:
+        return None
+
+
+def _decode_header(value: str | None) -> str:
+    # Unfold and decode RFC 2047 encoded words, to plain str
+    if not value:
+        return ""
+    value = FOLD_RE.sub("", value)
+    if "=?" not in value:
+        return value
+    # decode_header returns the text around encoded words as bytes, as undecodable (bytes, None)
+    # runs for non-ASCII text. Through latin-1 those are the header's UTF-8 bytes again.
+    try:
+        return "".join(
+            (part if isinstance(part, bytes) else part.encode("latin-1")).decode(charset or "utf-8", errors="replace")
+            for part, charset in decode_header(value.encode("utf-8").decode("latin-1"))
+        )
+    except (HeaderParseError, LookupError):
+        return value
+
+
+def _parse_headers(raw_email: bytes | bytearray) -> dict[str, Any]:
+    # Only the header block is parsed, with the compat32 policy. It leaves decoding to us instead of
+    # building header objects, which is much cheaper than the default policy.
+    header_end = HEADER_END_RE.search(raw_email)
+    header_block = raw_email[: header_end.start()] if header_end else raw_email
+    headers = HeaderParser(policy=compat32).parsestr(header_block.decode("utf-8", errors="replace"))
+
+    return {
+        "subject": _decode_header(headers.get("Subject")),
+        "from": _decode_header(headers.get("From")),
+        "date": _parse_date(header_block),
+    }
+
+
+def _parse_email_data(raw_email: bytes | bytearray) -> dict[str, Any]:
+    """Parse raw email data into a structured dictionary.
+
+    ``raw_email`` may be the FETCH literal itself, the parser decodes it without an intermediate copy.
+    """
+    parser = BytesParser(policy=default)
+    email_message = parser.parsebytes(raw_email)
+
+    # Only the preferred text/plain part is decoded, other alternatives are skipped
+    body_part = email_message.get_body(preferencelist=("plain",))
+    if body_part is None and not email_message.is_multipart():
+        # Single part emails that aren't text/plain, e.g. bare HTML
+        body_part = email_message
+    # Inline parts with a filename, like signature logos, aren't attachments
+    # walk() also finds attachments nested in signed or alternative parts
+    attachments = [
+        filename
+        for part in email_message.walk()
+        if part.get_content_disposition() == "attachment" and (filename := part.get_filename())
+    ]
+
+    return {
+        **_parse_headers(raw_email),
+        "body": _decode_payload(body_part) if body_part is not None else "",
+        "attachments": attachments,
+    }
+
+
+def _parse_headers_only(raw_headers: bytes | bytearray) -> dict[str, Any]:
+    """Parse only the header block of an email, body and attachments are left empty."""
+    return {
+        **_parse_headers(raw_headers),
+        "body": "",
+        "attachments": [],
+    }
+
+
+def _start_parse_pool() -> ProcessPoolExecutor | None:
+    global _parse_pool, _parse_pool_broken
+    with _parse_pool_lock:
+        if _parse_pool is None and not _parse_pool_broken:
+            # Forking a process with a running event loop and open sockets isn't safe, start clean workers
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            workers = os.cpu_count() or 1
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
+            try:
+                # Workers are started on submit, start them all here instead of on the event loop
+                for future in [pool.submit(int) for _ in range(workers)]:
+                    future.result()
+            except (BrokenProcessPool, OSError) as e:
+                logger.warning(f"Parse worker processes failed to start, parsing in threads instead: {e!s}")
+                _parse_pool_broken = True
+                pool.shutdown(wait=False, cancel_futures=True)
+            else:
+                _parse_pool = pool
+        return _parse_pool
+
+
+async def _parse_in_process(
+    parse: Callable[[bytes | bytearray], dict[str, Any]], raw_email: bytes | bytearray
+) -> dict[str, Any]:
+    global _parse_pool, _parse_pool_broken
+    pool = _parse_pool
+    if pool is None and not _parse_pool_broken:
+        pool = await asyncio.to_thread(_start_parse_pool)
+    if pool is not None:
+        try:
+            return await asyncio.get_running_loop().run_in_executor(pool, parse, raw_email)
+        except BrokenProcessPool:
+            if _parse_pool is pool:
+                logger.warning("Parse process pool is broken, parsing in threads instead")
+                _parse_pool_broken = True
+                _parse_pool = None
+                pool.shutdown(wait=False, cancel_futures=True)
+    return await asyncio.to_thread(parse, raw_email)
+
+
+class EmailConnectionPool:
+    """Authenticated IMAP connections kept open between calls, each used by one task at a time.
+
+    At most ``size`` connections are open at once, further callers of ``connection()`` wait
+    for one to be released, so providers' limits on sessions per account are respected. Idle
+    connections are kept, and a NOOP is sent on them every ``KEEPALIVE_INTERVAL`` seconds so
+    servers don't drop them (iCloud does after 30 minutes).
+    """
+
+    KEEPALIVE_INTERVAL = 25 * 60
+
+    def __init__(self, connect: Callable[[], Awaitable[Any]], size: int = 3):
+        self.connect = connect
+        self.size = size
+        self._idle: list[Any] = []
+        self._lost: set[Any] = set()
+        # Fetch format known to work on this server, per list of formats to try
+        self.fetch_formats: dict[tuple[str, ...], str] = {}
+        self._keepalive_task: asyncio.Task | None = None
+        # A connection is only opened or taken from the idle ones with a permit
+        self._semaphore = asyncio.Semaphore(size)
+        self._closed = False
+
+    async def acquire(self):
+        while self._idle:
+            imap = self._idle.pop()
+            if imap not in self._lost:
+                return imap
+            self._lost.discard(imap)
+
+        imap = await self.connect()
+        # aioimaplib only notices a dropped connection once a command times out, track it instead
+        imap.protocol.conn_lost_cb = lambda exc: self._lost.add(imap)
+        return imap
+
+    async def release(self, imap) -> None:
+        if self._closed or imap in self._lost or len(self._idle) >= self.size:
+            await self.discard(imap)
+            return
+
+        self._idle.append(imap)
+        if self._keepalive_task is None or self._keepalive_task.done():
+            self._keepalive_task = asyncio.create_task(self._keepalive())
+
+    async def discard(self, imap) -> None:
+        if imap in self._lost:
+            self._lost.discard(imap)
+            return
+        await _logout(imap)
+
+    def abort(self, imap) -> None:
+        # LOGOUT would first wait for the interrupted command to finish, close the connection instead
+        self._lost.discard(imap)
+        imap.protocol.conn_lost_cb = None
+        if imap.protocol.transport is not None:
+            imap.protocol.transport.close()
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[Any]:
+        async with self._semaphore:
+            imap = await self.acquire()
+            try:
+                yield imap
+            except BaseException:
+                # The session may be in any state, e.g. a cancelled FETCH still streaming
+                self.abort(imap)
+                raise
+            await self.release(imap)
+
+    async def _keepalive(self) -> None:
+        while self._idle:
+            await asyncio.sleep(self.KEEPALIVE_INTERVAL)
+            # One connection at a time, each counts against the limit while its NOOP runs
+            for _ in range(len(self._idle)):
+                async with self._semaphore:
+                    if not self._idle:
+                        break
+                    imap = self._idle.pop(0)
+                    try:
+                        await imap.noop()
+                    except Exception as e:
+                        logger.info(f"Dropping idle IMAP connection: {e}")
+                        self.abort(imap)
+                    else:
+                        await self.release(imap)
+
+    async def close(self) -> None:
+        # Connections still in use are logged out when they are released
+        self._closed = True
+        if self._keepalive_task is not None:
+            self._keepalive_task.cancel()
+        idle, self._idle = self._idle, []
+        for imap in idle:
+            await self.discard(imap)
+
+
+# One pool per account and its connection settings, handlers are created per request but sessions outlive them
+_connection_pools: dict[tuple[str, int, str, str, bool], EmailConnectionPool] = {}
+# Held while a pool is looked up or replaced, closing a stale pool awaits in between
+_connection_pools_lock = asyncio.Lock()
+# The idle authenticated SMTP connection of each account and its connection settings, picked up
+# by the next send, with the time.monotonic() it was left idle
+_smtp_connections: dict[tuple[str, int, str, str, bool, bool], tuple[aiosmtplib.SMTP, float]] = {}
+
+
+async def close_connection_pools() -> None:
+    pools = list(_connection_pools.values())
+    _connection_pools.clear()
+    for pool in pools:
+        await pool.close()
+
+    smtp_connections = list(_smtp_connections.values())
+    _smtp_connections.clear()
+    for smtp, _ in smtp_connections:
+        await _quit(smtp)
+
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = None
+
 
 class EmailClient:
-    def __init__(self, email_server: EmailServer, sender: str | None = None):
+    # Module level functions, so they can be sent to the parse process pool
+    _parse_email_data = staticmethod(_parse_email_data)
+    _parse_headers_only = staticmethod(_parse_headers_only)
+
+    def __init__(
+        self,
+        email_server: EmailServer,
+        sender: str | None = None,
+        fetch_batch_size: int = 50,
+        max_connections: int = 3,
+    ):
         self.email_server = email_server
         self.sender = sender or email_server.user_name
+        self.fetch_batch_size = max(1, min(fetch_batch_size, MAX_UIDS_PER_FETCH))
+        self.max_connections = max(1, max_connections)
 
         self.imap_class = aioimaplib.IMAP4_SSL if self.email_server.use_ssl else aioimaplib.IMAP4
 
         self.smtp_use_tls = self.email_server.use_ssl
         self.smtp_start_tls = self.email_server.start_ssl
 
-    def _parse_email_data(self, raw_email: bytes) -> dict[str, Any]:  # noqa: C901
-        """Parse raw email data into a structured dictionary."""
-        parser = BytesParser(policy=default)
-        email_message = parser.parsebytes(raw_email)
-
-        # Extract email parts
-        subject = email_message.get("Subject", "")
-        sender = email_message.get("From", "")
-        date_str = email_message.get("Date", "")
+    async def get_emails_stream(
+        self,
+        page: int = 1,
+        page_size: int = 10,
+        before: datetime | None = None,
+        since: datetime | None = None,
+        subject: str | None = None,
+        body: str | None = None,
+        text: str | None = None,
+        from_address: str | None = None,
+        to_address: str | None = None,
+        order: str = "desc",
+        is_unread: bool | None = None,
+        is_flagged: bool | None = None,
+        headers_only: bool = False,
+    ) -> AsyncGenerator[dict[str, Any], None]:
+        _, emails = await self._search_and_page(
+            page,
+            page_size,
+            before,
+            since,
+            subject,
+            body,
+            text,
+            from_address,
+            to_address,
+            order,
+            is_unread,
+            is_flagged,
+            headers_only,
+        )
+        async with aclosing(emails):
+            async for email_data in emails:
+                yield email_data
 
-        # Parse date
-        try:
-            date_tuple = email.utils.parsedate_tz(date_str)
-            date = datetime.fromtimestamp(email.utils.mktime_tz(date_tuple)) if date_tuple else datetime.now()
-        except Exception:
-            date = datetime.now()
-
-        # Get body content
-        body = ""
-        attachments = []
-
-        if email_message.is_multipart():
-            for part in email_message.walk():
-                content_type = part.get_content_type()
-                content_disposition = str(part.get("Content-Disposition", ""))
-
-                # Handle attachments
-                if "attachment" in content_disposition:
-                    filename = part.get_filename()
-                    if filename:
-                        attachments.append(filename)
-                # Handle text parts
-                elif content_type == "text/plain":
-                    body_part = part.get_payload(decode=True)
-                    if body_part:
-                        charset = part.get_content_charset("utf-8")
-                        try:
-                            body += body_part.decode(charset)
-                        except UnicodeDecodeError:
-                            body += body_part.decode("utf-8", errors="replace")
-        else:
-            # Handle plain text emails
-            payload = email_message.get_payload(decode=True)
-            if payload:
-                charset = email_message.get_content_charset("utf-8")
-                try:
-                    body = payload.decode(charset)
-                except UnicodeDecodeError:
-                    body = payload.decode("utf-8", errors="replace")
-
-        return {
-            "subject": subject,
-            "from": sender,
-            "body": body,
-            "date": date,
-            "attachments": attachments,
-        }
-
-    async def get_emails_stream(  # noqa: C901
+    async def _search_and_page(
         self,
         page: int = 1,
         page_size: int = 10,
@@ -97,7 +487,197 @@ class EmailClient:
         order: str = "desc",
         is_unread: bool | None = None,
         is_flagged: bool | None = None,
+        headers_only: bool = False,
+    ) -> tuple[int, AsyncIterator[dict[str, Any]]]:
+        """Run one search and return the total number of matches along with the emails of the page.
+
+        With ``headers_only`` only subject, sender and date are fetched, body and attachments are left empty.
+        """
+        pool = await self._connection_pool()
+        async with pool.connection() as imap:
+            search_criteria = self._build_search_criteria(
+                before, since, subject, body, text, from_address, to_address, is_unread, is_flagged
+            )
+            logger.info(f"Get: Search criteria: {search_criteria}")
+
+            start = (page - 1) * page_size
+            total, page_ids = await self._search_page(imap, search_criteria, start, start + page_size, order)
+
+        return total, self._fetch_page(pool, page_ids, headers_only)
+
+    async def _search_page(
+        self, imap: aioimaplib.IMAP4_SSL, search_criteria: list[str], start: int, end: int, order: str
+    ) -> tuple[int, list[str]]:
+        """Return the number of matching messages and the UIDs between ``start`` and ``end``.
+
+        The server does the paging where it can, so the full list of UIDs doesn't have to be
+        transferred and split for every page.
+        """
+        if "ESEARCH" in imap.protocol.capabilities:
+            uid_ranges = await self._esearch(imap, search_criteria)
+            if uid_ranges is not None:
+                total = sum(high - low + 1 for low, high in uid_ranges)
+                logger.info(f"Found {total} message IDs")
+                return total, self._slice_uid_ranges(uid_ranges, start, end, order)
+
+        # Search for messages - use UID SEARCH for better compatibility
+        _, messages = await imap.uid_search(*search_criteria)
+
+        # Handle empty or None responses
+        if not messages or not messages[0]:
+            logger.warning("No messages returned from search")
+            message_ids = []
+        else:
+            message_ids = messages[0].split()
+            logger.info(f"Found {len(message_ids)} message IDs")
+        total = len(message_ids)
+
+        # Only slice out the page, the newest messages are at the end of the search result
+        if order == "desc":
+            page_ids = message_ids[max(0, total - end) : max(0, total - start)][::-1]
+        else:
+            page_ids = message_ids[start:end]
+
+        return total, [message_id.decode("utf-8") for message_id in page_ids]
+
+    @staticmethod
+    async def _esearch(imap: aioimaplib.IMAP4_SSL, search_criteria: list[str]) -> list[tuple[int, int]] | None:
+        """The matching UIDs as a compact set of ranges, or None if the server refuses ESEARCH."""
+        result, lines = await _uid_esearch(imap, "ALL", search_criteria)
+        if result != "OK":
+            logger.warning(f"ESEARCH failed, falling back to SEARCH: {lines}")
+            return None
+
+        uid_ranges = []
+        for line in lines:
+            match = ESEARCH_ALL_RE.search(line) if isinstance(line, bytes) else None
+            if match:
+                for part in match.group(1).split(b","):
+                    low, _, high = part.partition(b":")
+                    low, high = int(low), int(high or low)
+                    uid_ranges.append((min(low, high), max(low, high)))
+        return sorted(uid_ranges)
+
+    @staticmethod
+    def _slice_uid_ranges(uid_ranges: list[tuple[int, int]], start: int, end: int, order: str) -> list[str]:
+        if order == "desc":
+            uids = (uid for low, high in reversed(uid_ranges) for uid in range(high, low - 1, -1))
+        else:
+            uids = (uid for low, high in uid_ranges for uid in range(low, high + 1))
+        return [str(uid) for uid in itertools.islice(uids, start, end)]
+
+    async def _fetch_page(
+        self, pool: EmailConnectionPool, page_ids: list[str], headers_only: bool = False
     ) -> AsyncGenerator[dict[str, Any], None]:
+        fetch_formats = HEADER_FETCH_FORMATS if headers_only else FETCH_FORMATS
+        parse = self._parse_headers_only if headers_only else self._parse_email_data
+
+        # Fetch the page in batches of UIDs, one round-trip per batch, spread over the
+        # pool's connections. Later batches are already on the wire while the current one
+        # is parsed, and emails are parsed in a worker thread while the consumer handles
+        # the previous ones.
+        batches = [page_ids[i : i + self.fetch_batch_size] for i in range(0, len(page_ids), self.fetch_batch_size)]
+        fetched_batches = asyncio.Queue(maxsize=FETCH_PREFETCH_BATCHES)
+        parsed_emails = asyncio.Queue(maxsize=PARSE_QUEUE_SIZE)
+        fetcher = asyncio.create_task(self._fetch_batches(pool, batches, fetched_batches, fetch_formats))
+        parser = asyncio.create_task(self._parse_batches(batches, fetched_batches, parsed_emails, parse))
+        try:
+            while (parsed_email := await parsed_emails.get()) is not None:
+                yield parsed_email
+        finally:
+            # The consumer may stop early, don't leave the fetchers and the parser running
+            parser.cancel()
+            fetcher.cancel()
+            await asyncio.gather(parser, fetcher, return_exceptions=True)
+
+    @staticmethod
+    async def _parse_batches(
+        batches: list[list[str]],
+        fetched_batches: asyncio.Queue,
+        parsed_emails: asyncio.Queue,
+        parse: Callable[[bytes | bytearray], dict[str, Any]],
+    ) -> None:
+        # Batches complete out of order, hold them back until their turn
+        pending, fetching = {}, True
+        # Parses run concurrently, their results are put into the queue in order
+        parsing: deque[asyncio.Task] = deque()
+        try:
+            for index, batch in enumerate(batches):
+                while fetching and index not in pending:
+                    fetched_batch = await fetched_batches.get()
+                    if fetched_batch is None:
+                        fetching = False
+                    else:
+                        pending.update(fetched_batch)
+                fetched = pending.pop(index, {})
+
+                # Servers answer in mailbox order, yield in the requested order instead
+                for message_id in batch:
+                    if message_id not in fetched:
+                        logger.error(f"Could not find email data in response for message ID: {message_id}")
+                        continue
+
+                    if len(parsing) >= PARSE_QUEUE_SIZE:
+                        await EmailClient._put_oldest(parsing, parsed_emails)
+                    parsing.append(asyncio.create_task(EmailClient._parse_fetched(parse, *fetched[message_id])))
+
+            while parsing:
+                await EmailClient._put_oldest(parsing, parsed_emails)
+        finally:
+            for task in parsing:
+                task.cancel()
+
+        # End marker for the consumer
+        await parsed_emails.put(None)
+
+    @staticmethod
+    async def _put_oldest(parsing: deque[asyncio.Task], parsed_emails: asyncio.Queue) -> None:
+        try:
+            parsed_email = await parsing.popleft()
+        except Exception as e:
+            # Log error but continue with other emails
+            logger.error(f"Error parsing email: {e!s}")
+            return
+        await parsed_emails.put(parsed_email)
+
+    @staticmethod
+    async def _parse_fetched(
+        parse: Callable[[bytes | bytearray], dict[str, Any]], email_flags: tuple[str, ...], raw_email: bytes | bytearray
+    ) -> dict[str, Any]:
+        # Parsing is CPU bound, keep the event loop free for the IMAP reads meanwhile.
+        # Big emails go to other processes so they are parsed in parallel.
+        if len(raw_email) >= PROCESS_PARSE_MIN_SIZE:
+            parsed_email = await _parse_in_process(parse, raw_email)
+        else:
+            parsed_email = await asyncio.to_thread(parse, raw_email)
+        # Add flag information to the parsed email
+        parsed_email["flags"] = email_flags
+        flag_mask = 0
+        for flag in email_flags:
+            flag_mask |= FLAG_BITS.get(flag, 0)
+        parsed_email["is_read"] = bool(flag_mask & SEEN)
+        parsed_email["is_answered"] = bool(flag_mask & ANSWERED)
+        parsed_email["is_flagged"] = bool(flag_mask & FLAGGED)
+        parsed_email["is_deleted"] = bool(flag_mask & DELETED)
+        parsed_email["is_draft"] = bool(flag_mask & DRAFT)
+        parsed_email["is_recent"] = bool(flag_mask & RECENT)
+        return parsed_email
+
+    async def _connection_pool(self) -> EmailConnectionPool:
+        server = self.email_server
+        # The pool reconnects with the settings of the client that created it, so they are part of
+        # the key: a changed password or SSL setting gets a new pool, and the old one is closed.
+        key = (server.host, server.port, server.user_name, server.password, server.use_ssl)
+        async with _connection_pools_lock:
+            pool = _connection_pools.get(key)
+            if pool is None:
+                for stale_key in [other for other in _connection_pools if other[:3] == key[:3]]:
+                    await _connection_pools.pop(stale_key).close()
+                pool = _connection_pools[key] = EmailConnectionPool(self._connect, size=self.max_connections)
+        return pool
+
+    async def _connect(self):
+        """Open an IMAP connection, login and select the inbox."""
         imap = self.imap_class(self.email_server.host, self.email_server.port)
         try:
             # Wait for the connection to be established
@@ -111,131 +691,102 @@ class EmailClient:
             except Exception as e:
                 logger.warning(f"IMAP ID command failed: {e!s}")
             await imap.select("INBOX")
+        except Exception:
+            await _logout(imap)
+            raise
+        return imap
 
-            search_criteria = self._build_search_criteria(
-                before, since, subject, body, text, from_address, to_address, is_unread, is_flagged
-            )
-            logger.info(f"Get: Search criteria: {search_criteria}")
-
-            # Search for messages - use UID SEARCH for better compatibility
-            _, messages = await imap.uid_search(*search_criteria)
+    async def _fetch_batches(
+        self,
+        pool: EmailConnectionPool,
+        batches: list[list[str]],
+        fetched_batches: asyncio.Queue,
+        fetch_formats: tuple[str, ...] = FETCH_FORMATS,
+    ) -> None:
+        """Fetch ``batches`` onto ``fetched_batches`` as ``{index: fetched}``, ``None`` marks the end."""
+        remaining = iter(enumerate(batches))
+
+        async def worker() -> None:
+            async with pool.connection() as imap:
+                for index, batch in remaining:
+                    await fetched_batches.put({index: await self._fetch_batch(pool, imap, batch, fetch_formats)})
+
+        # A single batch isn't worth opening another connection for
+        results = await asyncio.gather(*(worker() for _ in range(min(pool.size, len(batches)))), return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching messages: {result!s}")
+        await fetched_batches.put(None)
+
+    async def _fetch_batch(
+        self, pool: EmailConnectionPool, imap, uids: list[str], fetch_formats: tuple[str, ...] = FETCH_FORMATS
+    ) -> dict[str, tuple[tuple[str, ...], bytearray]]:
+        """Fetch several messages with a single UID FETCH.
+
+        Fetch formats are tried in turn for compatibility, the first one returning content is
+        remembered on the pool and used alone from then on.
+        """
+        uid_set = ",".join(uids)
+        known_format = pool.fetch_formats.get(fetch_formats)
+        for fetch_format in (known_format,) if known_format else fetch_formats:
+            # Unsupported formats get a BAD/NO response, exceptions mean the connection is broken
+            result, data = await imap.uid("fetch", uid_set, fetch_format)
+            logger.debug(f"IMAP response for UIDs {uid_set}: {len(data or [])} items")
+            fetched = self._parse_fetch_response(data or [])
+            if fetched:
+                pool.fetch_formats[fetch_formats] = fetch_format
+                return fetched
+            if fetch_format == known_format and result == "OK":
+                # The format works, the messages are gone, e.g. expunged since the SEARCH
+                return {}
+            # Only metadata (like 'FETCH (UID 71998)') came back, try next format
+            logger.debug(f"Fetch format {fetch_format} returned no email content")
+
+        if known_format:
+            # The format was rejected (BAD/NO), probe again
+            pool.fetch_formats.pop(fetch_formats, None)
+            return await self._fetch_batch(pool, imap, uids, fetch_formats)
+
+        logger.error(f"Failed to fetch UIDs {uid_set} with any format")
+        return {}
 
-            # Handle empty or None responses
-            if not messages or not messages[0]:
-                logger.warning("No messages returned from search")
-                message_ids = []
-            else:
-                message_ids = messages[0].split()
-                logger.info(f"Found {len(message_ids)} message IDs")
-            start = (page - 1) * page_size
-            end = start + page_size
-
-            if order == "desc":
-                message_ids.reverse()
-
-            # Fetch each message
-            for _, message_id in enumerate(message_ids[start:end]):
-                try:
-                    # Convert message_id from bytes to string
-                    message_id_str = message_id.decode("utf-8")
-
-                    # Fetch the email using UID - try different formats for compatibility
-                    data = None
-                    # Include FLAGS in fetch to get read/unread status
-                    # IMPORTANT: Use BODY.PEEK first to avoid marking messages as read
-                    fetch_formats = ["(BODY.PEEK[] FLAGS)", "BODY.PEEK[] FLAGS", "(BODY[] FLAGS)", "(RFC822 FLAGS)"]
-
-                    for fetch_format in fetch_formats:
-                        try:
-                            _, data = await imap.uid("fetch", message_id_str, fetch_format)
-
-                            if data and len(data) > 0:
-                                # Check if we got actual email content or just metadata
-                                has_content = False
-                                for item in data:
-                                    if (
-                                        isinstance(item, bytes)
-                                        and b"FETCH (" in item
-                                        and b"RFC822" not in item
-                                        and b"BODY" not in item
-                                    ):
-                                        # This is just metadata (like 'FETCH (UID 71998)'), not actual content
-                                        continue
-                                    elif isinstance(item, bytes | bytearray) and len(item) > 100:
-                                        # This looks like email content
-                                        has_content = True
-                                        break
-
-                                if has_content:
-                                    break
-                                else:
-                                    data = None  # Try next format
-
-                        except Exception as e:
-                            logger.debug(f"Fetch format {fetch_format} failed: {e}")
-                            data = None
-
-                    if not data:
-                        logger.error(f"Failed to fetch UID {message_id_str} with any format")
-                        continue
+    @staticmethod
+    def _parse_fetch_response(data: list) -> dict[str, tuple[tuple[str, ...], bytearray]]:
+        """Split a FETCH response into ``{uid: (flags, raw_email)}``.
+
+        Per RFC 3501 every message arrives as a ``N FETCH (... {size}`` line, the literal
+        itself and optionally a line carrying the attributes sent after the literal.
+        """
+        fetched = {}
+        metadata, literal = b"", None
+
+        def store() -> None:
+            uid_match = UID_RE.search(metadata)
+            if uid_match and literal is not None:
+                fetched[uid_match.group(1).decode()] = (EmailClient._extract_flags(metadata), literal)
+
+        for item in data:
+            if isinstance(item, bytearray):
+                literal = item
+            elif isinstance(item, bytes) and FETCH_LINE_RE.match(item):
+                store()
+                metadata, literal = item, None
+            elif isinstance(item, bytes) and literal is not None:
+                # Attributes following the literal, e.g. b' FLAGS (\\Seen) UID 71998)'
+                metadata += item
+        store()
+        return fetched
 
-                    # Find the email data and flags in the response
-                    raw_email = None
-                    email_flags = []
-
-                    # Debug log the raw IMAP response structure
-                    logger.debug(f"IMAP response for UID {message_id_str}: {len(data)} items")
-                    for i, item in enumerate(data):
-                        if isinstance(item, bytes):
-                            logger.debug(f"  Item {i} (bytes): {item[:200]}...")  # First 200 bytes
-
-                    # Parse the IMAP response to extract both email content and flags
-                    for item in data:
-                        if isinstance(item, bytes) and b"FLAGS (" in item:
-                            # Extract flags from response like: b'1 FETCH (FLAGS (\\Seen \\Answered) RFC822 {size}'
-                            start = item.find(b"FLAGS (") + 7
-                            end = item.find(b")", start)
-                            if start > 6 and end > start:
-                                flags_str = item[start:end].decode("utf-8", errors="ignore")
-                                email_flags = flags_str.split()
-                                logger.debug(f"Parsed flags from IMAP: {email_flags}")
-
-                        if isinstance(item, bytes | bytearray) and len(item) > 100:
-                            # Skip IMAP protocol responses
-                            if (
-                                isinstance(item, bytes)
-                                and b"FETCH" in item
-                                and not (b"From:" in item or b"Subject:" in item)
-                            ):
-                                continue
-                            # This is likely the email content
-                            raw_email = bytes(item) if isinstance(item, bytearray) else item
-
-                    if raw_email:
-                        try:
-                            parsed_email = self._parse_email_data(raw_email)
-                            # Add flag information to the parsed email
-                            parsed_email["flags"] = email_flags
-                            parsed_email["is_read"] = r"\Seen" in email_flags
-                            parsed_email["is_answered"] = r"\Answered" in email_flags
-                            parsed_email["is_flagged"] = r"\Flagged" in email_flags
-                            parsed_email["is_deleted"] = r"\Deleted" in email_flags
-                            parsed_email["is_draft"] = r"\Draft" in email_flags
-                            parsed_email["is_recent"] = r"\Recent" in email_flags
-                            yield parsed_email
-                        except Exception as e:
-                            # Log error but continue with other emails
-                            logger.error(f"Error parsing email: {e!s}")
-                    else:
-                        logger.error(f"Could not find email data in response for message ID: {message_id_str}")
-                except Exception as e:
-                    logger.error(f"Error fetching message {message_id}: {e!s}")
-        finally:
-            # Ensure we logout properly
-            try:
-                await imap.logout()
-            except Exception as e:
-                logger.info(f"Error during logout: {e}")
+    @staticmethod
+    def _extract_flags(metadata: bytes) -> tuple[str, ...]:
+        # Extract flags from response like: b'1 FETCH (FLAGS (\\Seen \\Answered) RFC822 {size}'
+        flags_match = FLAGS_RE.search(metadata)
+        if not flags_match:
+            return ()
+        email_flags = tuple(flags_match.group(1).decode("utf-8", errors="ignore").split())
+        # Formatted lazily, this runs for every fetched message
+        logger.debug("Parsed flags from IMAP: {}", email_flags)
+        return email_flags
 
     @staticmethod
     def _add_flag_criteria(search_criteria: list, is_unread: bool | None, is_flagged: bool | None) -> None:
@@ -299,28 +850,77 @@ class EmailClient:
         is_unread: bool | None = None,
         is_flagged: bool | None = None,
     ) -> int:
-        imap = self.imap_class(self.email_server.host, self.email_server.port)
-        try:
-            # Wait for the connection to be established
-            await imap._client_task
-            await imap.wait_hello_from_server()
-
-            # Login and select inbox
-            await imap.login(self.email_server.user_name, self.email_server.password)
-            await imap.select("INBOX")
+        pool = await self._connection_pool()
+        async with pool.connection() as imap:
             search_criteria = self._build_search_criteria(
                 before, since, subject, body, text, from_address, to_address, is_unread, is_flagged
             )
             logger.info(f"Count: Search criteria: {search_criteria}")
+            if "ESEARCH" in imap.protocol.capabilities:
+                # Only the count comes back, not every matching UID
+                result, lines = await _uid_esearch(imap, "COUNT", search_criteria)
+                if result == "OK":
+                    for line in lines:
+                        match = ESEARCH_COUNT_RE.search(line) if isinstance(line, bytes) else None
+                        if match:
+                            return int(match.group(1))
+                    return 0
+                logger.warning(f"ESEARCH failed, falling back to SEARCH: {lines}")
+
             # Search for messages and count them - use UID SEARCH for consistency
             _, messages = await imap.uid_search(*search_criteria)
             return len(messages[0].split())
-        finally:
-            # Ensure we logout properly
+
+    @asynccontextmanager
+    async def _smtp_connection(self) -> AsyncIterator[aiosmtplib.SMTP]:
+        """An authenticated SMTP connection, kept open afterwards for the next send of the account.
+
+        The idle connection is only reused if it was idle for less than ``SMTP_IDLE_TIMEOUT`` and
+        still answers a NOOP, which is cheaper than a new TLS handshake and login.
+        """
+        server = self.email_server
+        # Like the IMAP pools, a changed password or TLS mode must not reuse the old session
+        key = (server.host, server.port, server.user_name, server.password, self.smtp_use_tls, self.smtp_start_tls)
+        smtp, idle_since = _smtp_connections.pop(key, (None, 0.0))
+        for stale_key in [other for other in _smtp_connections if other[:3] == key[:3]]:
+            _smtp_connections.pop(stale_key)[0].close()
+
+        if smtp is not None and time.monotonic() - idle_since > SMTP_IDLE_TIMEOUT:
+            smtp.close()
+            smtp = None
+        if smtp is not None:
             try:
-                await imap.logout()
-            except Exception as e:
-                logger.info(f"Error during logout: {e}")
+                await smtp.noop(timeout=SMTP_NOOP_TIMEOUT)
+            except aiosmtplib.SMTPException as e:
+                logger.info(f"Idle SMTP connection is gone, reconnecting: {e}")
+                smtp.close()
+                smtp = None
+
+        if smtp is None:
+            smtp = aiosmtplib.SMTP(
+                hostname=self.email_server.host,
+                port=self.email_server.port,
+                start_tls=self.smtp_start_tls,
+                use_tls=self.smtp_use_tls,
+            )
+            await smtp.connect()
+            try:
+                await smtp.login(self.email_server.user_name, self.email_server.password)
+            except BaseException:
+                smtp.close()
+                raise
+
+        try:
+            yield smtp
+        except BaseException:
+            smtp.close()
+            raise
+
+        if key in _smtp_connections:
+            # Another send finished first, one idle connection per account is enough
+            await _quit(smtp)
+        else:
+            _smtp_connections[key] = (smtp, time.monotonic())
 
     async def send_email(
         self, recipients: list[str], subject: str, body: str, cc: list[str] | None = None, bcc: list[str] | None = None
@@ -337,14 +937,7 @@ class EmailClient:
         # Note: BCC recipients are not added to headers (they remain hidden)
         # but will be included in the actual recipients for SMTP delivery
 
-        async with aiosmtplib.SMTP(
-            hostname=self.email_server.host,
-            port=self.email_server.port,
-            start_tls=self.smtp_start_tls,
-            use_tls=self.smtp_use_tls,
-        ) as smtp:
-            await smtp.login(self.email_server.user_name, self.email_server.password)
-
+        async with self._smtp_connection() as smtp:
             # Create a combined list of all recipients for delivery
             all_recipients = recipients.copy()
             if cc:
@@ -358,7 +951,11 @@ class EmailClient:
 class ClassicEmailHandler(EmailHandler):
     def __init__(self, email_settings: EmailSettings):
         self.email_settings = email_settings
-        self.incoming_client = EmailClient(email_settings.incoming)
+        self.incoming_client = EmailClient(
+            email_settings.incoming,
+            fetch_batch_size=email_settings.incoming.fetch_batch_size,
+            max_connections=email_settings.incoming.max_connections,
+        )
         self.outgoing_client = EmailClient(
             email_settings.outgoing,
             sender=f"{email_settings.full_name} <{email_settings.email_address}>",
@@ -378,16 +975,26 @@ class ClassicEmailHandler(EmailHandler):
         order: str = "desc",
         is_unread: bool | None = None,
         is_flagged: bool | None = None,
+        headers_only: bool = False,
     ) -> EmailPageResponse:
-        emails = []
-        async for email_data in self.incoming_client.get_emails_stream(
-            page, page_size, before, since, subject, body, text, from_address, to_address, order, is_unread, is_flagged
-        ):
-            emails.append(EmailData.from_email(email_data))
-        total = await self.incoming_client.get_email_count(
-            before, since, subject, body, text, from_address, to_address, is_unread, is_flagged
+        total, emails_stream = await self.incoming_client._search_and_page(
+            page,
+            page_size,
+            before,
+            since,
+            subject,
+            body,
+            text,
+            from_address,
+            to_address,
+            order,
+            is_unread,
+            is_flagged,
+            headers_only,
         )
-        return EmailPageResponse(
+        emails = [EmailData.from_email(email_data) async for email_data in emails_stream]
+        # The emails are complete already, don't validate them again as part of the page
+        return EmailPageResponse.model_construct(
             page=page,
             page_size=page_size,
             before=before,
@@ -397,6 +1004,7 @@ class ClassicEmailHandler(EmailHandler):
             text=text,
             emails=emails,
             total=total,
+            headers_only=headers_only,
         )
 
     async def send_email(
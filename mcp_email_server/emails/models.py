@@ -1,10 +1,13 @@
 from datetime import datetime
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class EmailData(BaseModel):
+    # Validators are built on first use, and validated instances are never checked again
+    model_config = ConfigDict(defer_build=True, revalidate_instances="never")
+
     subject: str
     sender: str
     body: str
@@ -17,11 +20,15 @@ class EmailData(BaseModel):
     is_deleted: bool = False  # \Deleted flag
     is_draft: bool = False  # \Draft flag
     is_recent: bool = False  # \Recent flag
-    flags: list[str] = []  # Raw flags from IMAP
+    flags: tuple[str, ...] = ()  # Raw flags from IMAP
 
     @classmethod
     def from_email(cls, email: dict[str, Any]):
-        return cls(
+        """Build from a dict parsed by EmailClient, whose values already have the field types.
+
+        Validation is skipped, it would only re-check every field of every email in a page.
+        """
+        return cls.model_construct(
             subject=email["subject"],
             sender=email["from"],
             body=email["body"],
@@ -33,11 +40,13 @@ class EmailData(BaseModel):
             is_deleted=email.get("is_deleted", False),
             is_draft=email.get("is_draft", False),
             is_recent=email.get("is_recent", False),
-            flags=email.get("flags", []),
+            flags=tuple(email.get("flags", ())),
         )
 
 
 class EmailPageResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True, revalidate_instances="never")
+
     page: int
     page_size: int
     before: datetime | None
@@ -47,3 +56,4 @@ class EmailPageResponse(BaseModel):
     text: str | None
     emails: list[EmailData]
     total: int
+    headers_only: bool = False  # Emails carry no body or attachments
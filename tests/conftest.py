@@ -4,11 +4,12 @@ import asyncio
 import os
 from datetime import datetime
 from pathlib import Path
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
 from mcp_email_server.config import EmailServer, EmailSettings, ProviderSettings, delete_settings
+from mcp_email_server.emails.classic import close_connection_pools
 
 _HERE = Path(__file__).resolve().parent
 
@@ -22,6 +23,12 @@ def patch_env(monkeypatch: pytest.MonkeyPatch, tmp_path: pytest.TempPathFactory)
     yield
 
 
+@pytest.fixture(autouse=True)
+async def reset_connection_pools():
+    yield
+    await close_connection_pools()
+
+
 @pytest.fixture
 def email_server():
     """Fixture for a test EmailServer."""
@@ -69,11 +76,24 @@ def provider_settings():
 
 
 @pytest.fixture
-def mock_imap():
+def make_mock_imap():
+    """Fixture for a factory of mocked IMAP clients, for tests that open several connections."""
+
+    def make_mock_imap():
+        mock_imap = AsyncMock()
+        # A finished client task, as for a connected client
+        mock_imap._client_task = asyncio.Future()
+        mock_imap._client_task.set_result(None)
+        mock_imap.protocol.transport = MagicMock()
+        return mock_imap
+
+    return make_mock_imap
+
+
+@pytest.fixture
+async def mock_imap(make_mock_imap):
     """Fixture for a mocked IMAP client."""
-    mock_imap = AsyncMock()
-    mock_imap._client_task = asyncio.Future()
-    mock_imap._client_task.set_result(None)
+    mock_imap = make_mock_imap()
     mock_imap.wait_hello_from_server = AsyncMock()
     mock_imap.login = AsyncMock()
     mock_imap.select = AsyncMock()
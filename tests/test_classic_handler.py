@@ -50,6 +50,17 @@ class TestClassicEmailHandler:
         assert handler.outgoing_client.email_server == email_settings.outgoing
         assert handler.outgoing_client.sender == f"{email_settings.full_name} <{email_settings.email_address}>"
 
+    def test_init_imap_limits(self, email_settings):
+        """Test that the IMAP connection limit and fetch batch size come from the account settings."""
+        assert ClassicEmailHandler(email_settings).incoming_client.max_connections == 3
+
+        email_settings.incoming.max_connections = 5
+        email_settings.incoming.fetch_batch_size = 20
+        handler = ClassicEmailHandler(email_settings)
+
+        assert handler.incoming_client.max_connections == 5
+        assert handler.incoming_client.fetch_batch_size == 20
+
     @pytest.mark.asyncio
     async def test_get_emails(self, classic_handler):
         """Test get_emails method."""
@@ -63,15 +74,15 @@ class TestClassicEmailHandler:
             "attachments": [],
         }
 
-        # Mock the get_emails_stream method to yield our test data
-        mock_stream = AsyncMock()
-        mock_stream.__aiter__.return_value = [email_data]
+        async def emails_stream():
+            yield email_data
 
-        # Mock the get_email_count method
-        mock_count = AsyncMock(return_value=1)
+        # Mock the _search_and_page method to return the total and our test data
+        mock_search = AsyncMock(return_value=(1, emails_stream()))
+        mock_count = AsyncMock()
 
         # Apply the mocks
-        with patch.object(classic_handler.incoming_client, "get_emails_stream", return_value=mock_stream):
+        with patch.object(classic_handler.incoming_client, "_search_and_page", mock_search):
             with patch.object(classic_handler.incoming_client, "get_email_count", mock_count):
                 # Call the method
                 result = await classic_handler.get_emails(
@@ -104,13 +115,11 @@ class TestClassicEmailHandler:
                 assert result.emails[0].attachments == []
                 assert result.total == 1
 
-                # Verify the client methods were called correctly
-                classic_handler.incoming_client.get_emails_stream.assert_called_once_with(
-                    1, 10, now, None, "Test", None, None, "sender@example.com", None, "desc", None, None
-                )
-                mock_count.assert_called_once_with(
-                    now, None, "Test", None, None, "sender@example.com", None, None, None
+                # Verify the client methods were called correctly, the search also gives the total
+                mock_search.assert_called_once_with(
+                    1, 10, now, None, "Test", None, None, "sender@example.com", None, "desc", None, None, False
                 )
+                mock_count.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_send_email(self, classic_handler):
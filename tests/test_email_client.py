@@ -1,13 +1,34 @@
 import asyncio
 import email
-from datetime import datetime
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timezone
+from email.mime.application import MIMEApplication
+from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from email.parser import BytesParser
+from email.policy import default
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import aiosmtplib
 import pytest
+from aioimaplib import Response
 
 from mcp_email_server.config import EmailServer
-from mcp_email_server.emails.classic import EmailClient
+from mcp_email_server.emails import classic
+from mcp_email_server.emails.classic import (
+    FETCH_FORMATS,
+    PROCESS_PARSE_MIN_SIZE,
+    SMTP_IDLE_TIMEOUT,
+    SMTP_NOOP_TIMEOUT,
+    EmailClient,
+    EmailConnectionPool,
+    _parse_date,
+    _parse_date_header,
+    close_connection_pools,
+)
+from mcp_email_server.emails.models import EmailData
 
 
 @pytest.fixture
@@ -60,6 +81,9 @@ class TestEmailClient:
         assert isinstance(result["date"], datetime)
         assert result["attachments"] == []
 
+        # The FETCH literal is handed over as is
+        assert client._parse_email_data(bytearray(raw_email)) == result
+
     def test_parse_email_data_with_attachments(self):
         """Test parsing email with attachments."""
         # This would require creating a multipart email with attachments
@@ -76,20 +100,25 @@ class TestEmailClient:
             # Mock parts
             text_part = MagicMock()
             text_part.get_content_type.return_value = "text/plain"
-            text_part.get.return_value = ""  # Not an attachment
+            text_part.get_content_disposition.return_value = None  # Not an attachment
             text_part.get_payload.return_value = b"This is the email body"
             text_part.get_content_charset.return_value = "utf-8"
 
             attachment_part = MagicMock()
             attachment_part.get_content_type.return_value = "application/pdf"
-            attachment_part.get.return_value = "attachment; filename=test.pdf"
+            attachment_part.get_content_disposition.return_value = "attachment"
             attachment_part.get_filename.return_value = "test.pdf"
 
-            mock_email.walk.return_value = [text_part, attachment_part]
+            mock_email.get_body.return_value = text_part
+            mock_email.walk.return_value = [mock_email, text_part, attachment_part]
             mock_parse.return_value = mock_email
 
             client = EmailClient(MagicMock())
-            result = client._parse_email_data(b"dummy email content")
+            # Headers are read from the raw bytes, the mocked message provides the parts
+            raw_headers = b"Subject: Test Subject\r\nFrom: sender@example.com\r\nDate: %s\r\n\r\n" % (
+                email.utils.formatdate().encode()
+            )
+            result = client._parse_email_data(raw_headers)
 
             assert result["subject"] == "Test Subject"
             assert result["from"] == "sender@example.com"
@@ -97,6 +126,145 @@ class TestEmailClient:
             assert isinstance(result["date"], datetime)
             assert result["attachments"] == ["test.pdf"]
 
+    def test_parse_email_data_multipart(self):
+        """Test parsing a multipart email with several text parts and attachments."""
+        msg = MIMEMultipart()
+        msg["Subject"] = "Test Subject"
+        msg["From"] = "sender@example.com"
+        msg["Date"] = email.utils.formatdate()
+        msg.attach(MIMEText("Caf\u00e9 body", _charset="iso-8859-1"))
+        msg.attach(MIMEText("Second part"))
+        inline = MIMEText("Inline file")
+        inline.add_header("Content-Disposition", "inline", filename="inline.txt")
+        msg.attach(inline)
+        attachment = MIMEApplication(b"%PDF", Name="test.pdf")
+        attachment.add_header("Content-Disposition", "attachment", filename="test.pdf")
+        msg.attach(attachment)
+
+        client = EmailClient(MagicMock())
+        result = client._parse_email_data(msg.as_bytes())
+
+        assert result["body"] == "Caf\u00e9 body"
+        assert result["attachments"] == ["test.pdf"]
+
+    def test_parse_email_data_nested_alternative(self):
+        """Test that only the plain alternative of a nested multipart/alternative is used as body."""
+        alternative = MIMEMultipart("alternative")
+        alternative.attach(MIMEText("Plain body"))
+        alternative.attach(MIMEText("<p>HTML body</p>", "html"))
+        msg = MIMEMultipart()
+        msg["Subject"] = "Test Subject"
+        msg.attach(alternative)
+        attachment = MIMEApplication(b"%PDF", Name="test.pdf")
+        attachment.add_header("Content-Disposition", "attachment", filename="test.pdf")
+        msg.attach(attachment)
+
+        result = EmailClient(MagicMock())._parse_email_data(msg.as_bytes())
+
+        assert result["body"] == "Plain body"
+        assert result["attachments"] == ["test.pdf"]
+
+        html_only = MIMEText("<p>HTML body</p>", "html")
+        assert EmailClient(MagicMock())._parse_email_data(html_only.as_bytes())["body"] == "<p>HTML body</p>"
+
+    def test_parse_email_data_nested_attachments(self):
+        """Test that attachments nested in signed or alternative parts are reported."""
+        mixed = MIMEMultipart()
+        mixed.attach(MIMEText("Signed body"))
+        report = MIMEApplication(b"%PDF", Name="report.pdf")
+        report.add_header("Content-Disposition", "attachment", filename="report.pdf")
+        mixed.attach(report)
+        signature = MIMEApplication(b"signature", "pkcs7-signature", Name="smime.p7s")
+        signature.add_header("Content-Disposition", "attachment", filename="smime.p7s")
+        signed = MIMEMultipart("signed", protocol="application/pkcs7-signature")
+        signed["Subject"] = "Signed"
+        signed.attach(mixed)
+        signed.attach(signature)
+
+        result = EmailClient(MagicMock())._parse_email_data(signed.as_bytes())
+
+        assert result["body"] == "Signed body"
+        assert result["attachments"] == ["report.pdf", "smime.p7s"]
+
+        # Apple Mail puts attachments next to the HTML alternative
+        html_mixed = MIMEMultipart()
+        html_mixed.attach(MIMEText("<p>HTML body</p>", "html"))
+        invoice = MIMEApplication(b"%PDF", Name="invoice.pdf")
+        invoice.add_header("Content-Disposition", "attachment", filename="invoice.pdf")
+        html_mixed.attach(invoice)
+        alternative = MIMEMultipart("alternative")
+        alternative.attach(MIMEText("Plain body"))
+        alternative.attach(html_mixed)
+
+        result = EmailClient(MagicMock())._parse_email_data(alternative.as_bytes())
+
+        assert result["body"] == "Plain body"
+        assert result["attachments"] == ["invoice.pdf"]
+
+    @pytest.mark.parametrize(
+        "date_header",
+        [
+            "Mon, 1 Jan 2024 00:00:00 +0000",
+            "1 Jan 2024 13:45:10 -0830",
+            "Tue, 29 Feb 2000 23:59:59 +1400",
+            "Mon, 1 Jan 2024 00:00:00 GMT",
+            "Mon, 01 Jan 2024 00:00 +0100",
+            "Mon, 31 Feb 2024 00:00:00 +0000",
+            "Mon, 1 Jan 2024\r\n 00:00:00 +0000",
+        ],
+    )
+    def test_parse_date(self, date_header):
+        """Test that the fast path gives the same date as the stdlib parser."""
+        raw_headers = (
+            b"Subject: Test\r\nDATE: %s\r\n\r\nDate: Fri, 5 May 2000 00:00:00 +0000\r\n" % date_header.encode()
+        )
+
+        expected = datetime.fromtimestamp(email.utils.mktime_tz(email.utils.parsedate_tz(date_header)))
+        assert _parse_date(raw_headers) == expected
+
+    def test_parse_date_cached(self):
+        """Test that repeated Date headers are parsed once and invalid ones fall back to now."""
+        _parse_date_header.cache_clear()
+        raw_headers = b"Subject: Test\r\nDate: Mon, 1 Jan 2024 00:00:00 +0000\r\n\r\n"
+
+        assert _parse_date(raw_headers) == _parse_date(bytearray(raw_headers))
+        assert _parse_date_header.cache_info().hits == 1
+
+        before = datetime.now()
+        assert _parse_date(b"Subject: Test\r\nDate: not a date\r\n\r\n") >= before
+        assert _parse_date(b"Subject: Test\r\n\r\n") >= before
+
+    @pytest.mark.parametrize(
+        "raw_headers",
+        [
+            b"Subject: =?utf-8?q?Caf=C3=A9?= au lait\r\nFrom: =?utf-8?q?Caf=C3=A9?= <sender@example.com>\r\n\r\n",
+            "Subject: Gr\u00fc\u00dfe\r\nFrom: J\u00f6rg <sender@example.com>\r\n\r\nBody".encode(),
+            b'Subject: A long\r\n folded subject\r\nFrom: "Last, First" <sender@example.com>\r\n\r\n',
+            b"Subject: =?iso-8859-1?q?caf=E9?=\r\n =?utf-8?b?w6k=?= x\r\nFrom: sender@example.com",
+            b"From: sender@example.com\r\n\r\nSubject: Not a header\r\n",
+            "Subject: Re: =?utf-8?q?Caf=C3=A9?= \u00fcnd\r\nFrom: =?utf-8?q?J=C3=B6rg?= \u4e2d <sender@example.com>\r\n".encode(),
+            b"Subject: =?utf-8?q?Path?= C:\\users\r\nFrom: sender@example.com\r\n",
+        ],
+    )
+    def test_parse_headers_only(self, raw_headers):
+        """Test that subject and sender decode like the default policy would."""
+        email_message = BytesParser(policy=default).parsebytes(raw_headers)
+
+        result = EmailClient._parse_headers_only(raw_headers)
+
+        assert result["subject"] == str(email_message.get("Subject", ""))
+        assert result["from"] == str(email_message.get("From", ""))
+        assert result["body"] == ""
+
+    def test_extract_flags(self):
+        """Test extracting flags from FETCH metadata."""
+        assert EmailClient._extract_flags(b"1 FETCH (UID 1 FLAGS (\\Seen $Forwarded) BODY[] {10}") == (
+            "\\Seen",
+            "$Forwarded",
+        )
+        assert EmailClient._extract_flags(b"1 FETCH (UID 1 FLAGS () BODY[] {10}") == ()
+        assert EmailClient._extract_flags(b"1 FETCH (UID 1 BODY[] {10}") == ()
+
     def test_build_search_criteria(self):
         """Test building search criteria for IMAP."""
         # Test with no criteria (should return ["ALL"])
@@ -157,18 +325,10 @@ class TestEmailClient:
         assert criteria == ["SUBJECT", "Test", "UNSEEN", "UNFLAGGED"]
 
     @pytest.mark.asyncio
-    async def test_get_emails_stream(self, email_client):
+    async def test_get_emails_stream(self, email_client, mock_imap):
         """Test getting emails stream."""
         # Mock IMAP client
-        mock_imap = AsyncMock()
-        mock_imap._client_task = asyncio.Future()
-        mock_imap._client_task.set_result(None)
-        mock_imap.wait_hello_from_server = AsyncMock()
-        mock_imap.login = AsyncMock()
-        mock_imap.select = AsyncMock()
-        mock_imap.search = AsyncMock(return_value=(None, [b"1 2 3"]))
         mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2 3"]))
-        mock_imap.fetch = AsyncMock(return_value=(None, [b"HEADER", bytearray(b"EMAIL CONTENT")]))
         # Create a simple email with headers for testing
         test_email = b"""From: sender@example.com\r
 To: recipient@example.com\r
@@ -176,10 +336,13 @@ Subject: Test Subject\r
 Date: Mon, 1 Jan 2024 00:00:00 +0000\r
 \r
 This is the email body."""
-        mock_imap.uid = AsyncMock(
-            return_value=(None, [b"1 FETCH (UID 1 RFC822 {%d}" % len(test_email), bytearray(test_email)])
-        )
-        mock_imap.logout = AsyncMock()
+        fetch_response = []
+        for uid in (1, 2, 3):
+            fetch_response.extend([
+                b"%d FETCH (UID %d RFC822 {%d}" % (uid, uid, len(test_email)),
+                bytearray(test_email),
+            ])
+        mock_imap.uid = AsyncMock(return_value=(None, fetch_response))
 
         # Mock IMAP class
         with patch.object(email_client, "imap_class", return_value=mock_imap):
@@ -208,19 +371,392 @@ This is the email body."""
                 )
                 mock_imap.select.assert_called_once_with("INBOX")
                 mock_imap.uid_search.assert_called_once_with("ALL")
-                assert mock_imap.uid.call_count == 3
-                mock_imap.logout.assert_called_once()
+                # All three messages are fetched with a single UID FETCH
+                mock_imap.uid.assert_called_once_with("fetch", "3,2,1", "(BODY.PEEK[] FLAGS UID)")
+                # The connection is kept open for the next call
+                mock_imap.logout.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_emails_stream_batches(self, email_server, mock_imap):
+        """Test that a page is fetched in batches and yielded in the requested order."""
+        email_client = EmailClient(email_server, fetch_batch_size=2)
+
+        mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2 3 4 5"]))
+
+        def fetch(command, uid_set, fetch_format):
+            # Servers answer in ascending UID order whatever the order of the set
+            response = []
+            for uid in sorted(uid_set.split(","), key=int):
+                test_email = b"Subject: Email %s\r\n\r\nBody" % uid.encode()
+                response.extend([b"%s FETCH (UID %s BODY[] {%d}" % (uid.encode(), uid.encode(), len(test_email))])
+                response.extend([bytearray(test_email), b" FLAGS (\\Seen))"])
+            response.append(b"Success")
+            return None, response
+
+        mock_imap.uid = AsyncMock(side_effect=fetch)
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            emails = [email async for email in email_client.get_emails_stream(page=1, page_size=5)]
+
+        assert [email["subject"] for email in emails] == [f"Email {uid}" for uid in (5, 4, 3, 2, 1)]
+        assert all(email["is_read"] for email in emails)
+        assert sorted(call.args[1] for call in mock_imap.uid.call_args_list) == ["1", "3,2", "5,4"]
+
+    @pytest.mark.asyncio
+    async def test_get_emails_stream_multiple_connections(self, email_server, make_mock_imap):
+        """Test that batches are spread over several connections which are kept for reuse."""
+        email_client = EmailClient(email_server, fetch_batch_size=1, max_connections=3)
+
+        connections = []
+
+        def connect(host, port):
+            mock_imap = make_mock_imap()
+            mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2 3 4 5"]))
+
+            async def fetch(command, uid_set, fetch_format):
+                # Let the other connections run, so batches complete out of order
+                await asyncio.sleep(0.01 * int(uid_set))
+                test_email = b"Subject: Email %s\r\n\r\nBody" % uid_set.encode()
+                return None, [
+                    b"1 FETCH (UID %s BODY[] {%d}" % (uid_set.encode(), len(test_email)),
+                    bytearray(test_email),
+                ]
+
+            mock_imap.uid = AsyncMock(side_effect=fetch)
+            connections.append(mock_imap)
+            return mock_imap
+
+        with patch.object(email_client, "imap_class", side_effect=connect):
+            emails = [email async for email in email_client.get_emails_stream(page=1, page_size=5, order="asc")]
+
+        assert [email["subject"] for email in emails] == [f"Email {uid}" for uid in (1, 2, 3, 4, 5)]
+        assert len(connections) == 3
+        assert sum(imap.uid.call_count for imap in connections) == 5
+        for imap in connections:
+            imap.logout.assert_not_called()
+
+        await close_connection_pools()
+        for imap in connections:
+            imap.logout.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_connection_limit(self, email_server, make_mock_imap):
+        """Test that concurrent calls never open more than max_connections sessions."""
+        email_client = EmailClient(email_server, max_connections=2)
+        connections, in_use = [], []
+
+        def connect(host, port):
+            mock_imap = make_mock_imap()
+
+            async def search(*criteria):
+                in_use.append(mock_imap)
+                await asyncio.sleep(0.01)
+                assert len(in_use) <= 2
+                in_use.remove(mock_imap)
+                return None, [b"1 2 3"]
+
+            mock_imap.uid_search = AsyncMock(side_effect=search)
+            connections.append(mock_imap)
+            return mock_imap
+
+        with patch.object(email_client, "imap_class", side_effect=connect):
+            counts = await asyncio.gather(*(email_client.get_email_count() for _ in range(5)))
+
+        assert counts == [3] * 5
+        assert len(connections) == 2
+
+    @pytest.mark.asyncio
+    async def test_search_and_page(self, email_client, mock_imap):
+        """Test that one search gives both the total and the page."""
+        mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2 3 4 5"]))
+
+        def fetch(command, uid_set, fetch_format):
+            response = []
+            for uid in uid_set.split(","):
+                test_email = b"Subject: Email %s\r\n\r\nBody" % uid.encode()
+                response.extend([
+                    b"1 FETCH (UID %s BODY[] {%d}" % (uid.encode(), len(test_email)),
+                    bytearray(test_email),
+                ])
+            return None, response
+
+        mock_imap.uid = AsyncMock(side_effect=fetch)
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            total, emails = await email_client._search_and_page(page=2, page_size=2, subject="Test")
+            emails = [email async for email in emails]
+
+        assert total == 5
+        assert [email["subject"] for email in emails] == ["Email 3", "Email 2"]
+        mock_imap.uid_search.assert_called_once_with("SUBJECT", "Test")
+
+    @pytest.mark.asyncio
+    async def test_get_emails_stream_headers_only(self, email_client, mock_imap):
+        """Test that listing emails fetches and parses headers only."""
+        mock_imap.uid_search = AsyncMock(return_value=(None, [b"1"]))
+        headers = b"Subject: Test Subject\r\nFrom: sender@example.com\r\nDate: Mon, 1 Jan 2024 00:00:00 +0000\r\n\r\n"
+        mock_imap.uid = AsyncMock(
+            return_value=(
+                None,
+                [
+                    b"1 FETCH (UID 1 FLAGS (\\Seen) BODY[HEADER.FIELDS (SUBJECT FROM DATE MESSAGE-ID)] {%d}"
+                    % len(headers),
+                    bytearray(headers),
+                    b")",
+                ],
+            )
+        )
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            emails = [email async for email in email_client.get_emails_stream(headers_only=True)]
+
+        assert len(emails) == 1
+        assert emails[0]["subject"] == "Test Subject"
+        assert emails[0]["from"] == "sender@example.com"
+        assert emails[0]["date"] == datetime(2024, 1, 1, tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+        assert emails[0]["body"] == ""
+        assert emails[0]["attachments"] == []
+        assert emails[0]["is_read"] is True
+        mock_imap.uid.assert_called_once_with(
+            "fetch", "1", "(BODY.PEEK[HEADER.FIELDS (SUBJECT FROM DATE MESSAGE-ID)] FLAGS UID)"
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "page, order, expected",
+        [
+            (1, "desc", ["5", "4"]),
+            (3, "desc", ["1"]),
+            (4, "desc", []),
+            (1, "asc", ["1", "2"]),
+            (3, "asc", ["5"]),
+            (4, "asc", []),
+        ],
+    )
+    async def test_search_and_page_slices(self, email_client, page, order, expected, mock_imap):
+        """Test that only the requested page is fetched, in the requested order."""
+        mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2 3 4 5"]))
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            with patch.object(email_client, "_fetch_page") as mock_fetch_page:
+                total, _ = await email_client._search_and_page(page=page, page_size=2, order=order)
+
+        assert total == 5
+        assert mock_fetch_page.call_args.args[1] == expected
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "page, order, expected",
+        [
+            (1, "desc", ["10", "9", "7"]),
+            (2, "desc", ["3", "2", "1"]),
+            (3, "desc", []),
+            (1, "asc", ["1", "2", "3"]),
+            (2, "asc", ["7", "9", "10"]),
+        ],
+    )
+    async def test_search_and_page_esearch(self, email_client, page, order, expected, mock_imap):
+        """Test that servers with ESEARCH return the matches as UID ranges."""
+        mock_imap.timeout = 10
+        mock_imap.protocol.capabilities = {"IMAP4REV1", "ESEARCH"}
+        mock_imap.protocol.loop = asyncio.get_running_loop()
+        mock_imap.protocol.new_tag = MagicMock(return_value="A1")
+        mock_imap.protocol.execute = AsyncMock(
+            return_value=Response("OK", [b'(TAG "A1") UID ALL 9:10,1:3,7', b"Search completed."])
+        )
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            with patch.object(email_client, "_fetch_page") as mock_fetch_page:
+                total, _ = await email_client._search_and_page(page=page, page_size=3, order=order, subject="Test")
+
+        assert total == 6
+        assert mock_fetch_page.call_args.args[1] == expected
+        command = mock_imap.protocol.execute.call_args.args[0]
+        assert command.untagged_resp_name == "ESEARCH"
+        assert command.args == ("RETURN", "(ALL)", "CHARSET", "utf-8", "SUBJECT", "Test")
+        mock_imap.uid_search.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_get_emails_stream_with_flags(self, email_client):
+    async def test_get_emails_stream_prefetches_next_batch(self, email_server, mock_imap):
+        """Test that the next batch is fetched while the current one is consumed."""
+        email_client = EmailClient(email_server, fetch_batch_size=1, max_connections=1)
+
+        mock_imap.uid_search = AsyncMock(return_value=(None, [b" ".join(b"%d" % uid for uid in range(1, 51))]))
+
+        def fetch(command, uid_set, fetch_format):
+            test_email = b"Subject: Email %s\r\n\r\nBody" % uid_set.encode()
+            return None, [b"1 FETCH (UID %s BODY[] {%d}" % (uid_set.encode(), len(test_email)), bytearray(test_email)]
+
+        mock_imap.uid = AsyncMock(side_effect=fetch)
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            stream = email_client.get_emails_stream(page=1, page_size=50)
+            first = await anext(stream)
+            await asyncio.sleep(0)
+
+            assert first["subject"] == "Email 50"
+            # The next batches are fetched while the first email is consumed
+            assert mock_imap.uid.call_count > 1
+
+            # Closing the stream early stops fetching and drops the interrupted connection
+            await stream.aclose()
+            await asyncio.sleep(0)
+            assert mock_imap.uid.call_count < 50
+            mock_imap.protocol.transport.close.assert_called_once()
+            mock_imap.logout.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_emails_stream_parses_big_emails_in_process(self, email_client, mock_imap):
+        """Test that big emails are parsed in the process pool and small ones in a thread."""
+        mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2"]))
+        emails = {
+            b"1": b"Subject: Small\r\n\r\nSmall body",
+            b"2": b"Subject: Big\r\n\r\n" + b"x" * PROCESS_PARSE_MIN_SIZE,
+        }
+        fetch_response = []
+        for uid, raw_email in emails.items():
+            fetch_response.extend([b"1 FETCH (UID %s BODY[] {%d}" % (uid, len(raw_email)), bytearray(raw_email)])
+        mock_imap.uid = AsyncMock(return_value=(None, fetch_response))
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            with patch(
+                "mcp_email_server.emails.classic._parse_in_process", wraps=classic._parse_in_process
+            ) as parse_in_process:
+                parsed = [email async for email in email_client.get_emails_stream(order="asc")]
+
+        assert [email["subject"] for email in parsed] == ["Small", "Big"]
+        assert parsed[1]["body"] == "x" * PROCESS_PARSE_MIN_SIZE
+        parse_in_process.assert_called_once()
+        assert parse_in_process.call_args.args[1] == emails[b"2"]
+
+    @pytest.mark.asyncio
+    async def test_get_emails_stream_parses_concurrently(self, email_client, mock_imap):
+        """Test that the emails of a batch are parsed at the same time and still yielded in order."""
+        mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2 3 4"]))
+        fetch_response = []
+        for uid in (b"1", b"2", b"3", b"4"):
+            raw_email = b"Subject: Email %s\r\n\r\n" % uid + b"x" * PROCESS_PARSE_MIN_SIZE
+            fetch_response.extend([b"1 FETCH (UID %s BODY[] {%d}" % (uid, len(raw_email)), bytearray(raw_email)])
+        mock_imap.uid = AsyncMock(return_value=(None, fetch_response))
+
+        running = peak = 0
+
+        async def parse_in_process(parse, raw_email):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            # Finish the first email last
+            await asyncio.sleep(0.05 if b"Email 1" in raw_email else 0.01)
+            running -= 1
+            return parse(raw_email)
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            with patch("mcp_email_server.emails.classic._parse_in_process", side_effect=parse_in_process):
+                parsed = [email async for email in email_client.get_emails_stream(order="asc")]
+
+        assert [email["subject"] for email in parsed] == ["Email 1", "Email 2", "Email 3", "Email 4"]
+        assert peak == 4
+
+    @pytest.mark.asyncio
+    async def test_parse_pool_failure_remembered(self):
+        """Test that worker processes which can't start are tried once, off the event loop."""
+        start_threads = []
+
+        def start_pool(**kwargs):
+            start_threads.append(threading.current_thread())
+            pool = MagicMock()
+            pool.submit.return_value.result.side_effect = BrokenProcessPool("worker died")
+            return pool
+
+        raw_email = b"Subject: Big\r\n\r\n" + b"x" * PROCESS_PARSE_MIN_SIZE
+        with patch.object(classic, "_parse_pool_broken", False):
+            with patch.object(classic, "ProcessPoolExecutor", side_effect=start_pool) as pool_class:
+                parsed = [await classic._parse_in_process(classic._parse_email_data, raw_email) for _ in range(3)]
+
+        assert [email["subject"] for email in parsed] == ["Big"] * 3
+        pool_class.assert_called_once()
+        assert start_threads[0] is not threading.main_thread()
+        assert classic._parse_pool is None
+
+    @pytest.mark.asyncio
+    async def test_close_connection_pools_shuts_down_parse_pool(self):
+        """Test that the parse process pool is shut down with the connection pools."""
+        parse_pool = MagicMock()
+        with patch.object(classic, "_parse_pool", parse_pool):
+            await close_connection_pools()
+            assert classic._parse_pool is None
+        parse_pool.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+    @pytest.mark.asyncio
+    async def test_fetch_format_remembered(self, email_server, mock_imap):
+        """Test that fetch formats are probed once and the working one is reused."""
+        email_client = EmailClient(email_server, fetch_batch_size=1, max_connections=1)
+
+        mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2 3"]))
+        supported_formats = {"(BODY[] FLAGS UID)"}
+        expunged = set()
+
+        def fetch(command, uid_set, fetch_format):
+            if fetch_format not in supported_formats:
+                return "BAD", [b"Command Argument Error. 11"]
+            if uid_set in expunged:
+                return "OK", [b"Fetch completed."]
+            test_email = b"Subject: Email %s\r\n\r\nBody" % uid_set.encode()
+            return "OK", [b"1 FETCH (UID %s BODY[] {%d}" % (uid_set.encode(), len(test_email)), bytearray(test_email)]
+
+        mock_imap.uid = AsyncMock(side_effect=fetch)
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            emails = [email async for email in email_client.get_emails_stream(page_size=2)]
+            assert len(emails) == 2
+            assert [call.args[2] for call in mock_imap.uid.call_args_list] == [
+                "(BODY.PEEK[] FLAGS UID)",
+                "BODY.PEEK[] FLAGS UID",
+                "(BODY[] FLAGS UID)",
+                "(BODY[] FLAGS UID)",
+            ]
+
+            # The remembered format stops working, the formats are probed again
+            mock_imap.uid.reset_mock()
+            supported_formats = {"(RFC822 FLAGS UID)"}
+            emails = [email async for email in email_client.get_emails_stream(page_size=1)]
+            assert len(emails) == 1
+            assert [call.args[2] for call in mock_imap.uid.call_args_list] == [
+                "(BODY[] FLAGS UID)",
+                *FETCH_FORMATS,
+            ]
+
+            # Messages expunged since the search don't make the remembered format look broken
+            mock_imap.uid.reset_mock()
+            expunged = {"3"}
+            emails = [email async for email in email_client.get_emails_stream(page_size=1)]
+            assert emails == []
+            assert [call.args[2] for call in mock_imap.uid.call_args_list] == ["(RFC822 FLAGS UID)"]
+
+    def test_parse_fetch_response(self):
+        """Test splitting a multi-message FETCH response."""
+        data = [
+            b"1 FETCH (UID 10 FLAGS (\\Seen \\Answered) BODY[] {5}",
+            bytearray(b"first"),
+            b")",
+            b"2 FETCH (UID 11 BODY[] {6}",
+            bytearray(b"second"),
+            b" FLAGS (\\Flagged))",
+            b"3 FETCH (UID 12 FLAGS ())",
+            b"Success",
+        ]
+
+        fetched = EmailClient._parse_fetch_response(data)
+
+        assert fetched == {
+            "10": (("\\Seen", "\\Answered"), bytearray(b"first")),
+            "11": (("\\Flagged",), bytearray(b"second")),
+        }
+
+    @pytest.mark.asyncio
+    async def test_get_emails_stream_with_flags(self, email_client, mock_imap):
         """Test getting emails with flags."""
         # Mock IMAP client
-        mock_imap = AsyncMock()
-        mock_imap._client_task = asyncio.Future()
-        mock_imap._client_task.set_result(None)
-        mock_imap.wait_hello_from_server = AsyncMock()
-        mock_imap.login = AsyncMock()
-        mock_imap.select = AsyncMock()
         mock_imap.uid_search = AsyncMock(return_value=(None, [b"1"]))
 
         # Create email with headers and include FLAGS in response
@@ -238,7 +774,6 @@ This is the email body."""
                 [b"1 FETCH (FLAGS (\\Seen \\Flagged) UID 1 RFC822 {%d}" % len(test_email), bytearray(test_email)],
             )
         )
-        mock_imap.logout = AsyncMock()
 
         # Mock IMAP class
         with patch.object(email_client, "imap_class", return_value=mock_imap):
@@ -251,12 +786,16 @@ This is the email body."""
             email = emails[0]
 
             # Check flag data
-            assert email["is_read"] is True  # \\Seen flag is set
-            assert email["is_flagged"] is True  # \\Flagged flag is set
-            assert email["is_answered"] is False
-            assert email["is_deleted"] is False
+            assert email["is_read"] is True
+            assert email["is_flagged"] is True
             assert email["is_draft"] is False
-            assert email["is_recent"] is False
+            email_data = EmailData.from_email(email)
+            assert email_data.is_read is True  # \\Seen flag is set
+            assert email_data.is_flagged is True  # \\Flagged flag is set
+            assert email_data.is_answered is False
+            assert email_data.is_deleted is False
+            assert email_data.is_draft is False
+            assert email_data.is_recent is False
             assert "\\Seen" in email["flags"]
             assert "\\Flagged" in email["flags"]
 
@@ -264,18 +803,11 @@ This is the email body."""
             mock_imap.uid_search.assert_called_once_with("SEEN")
 
     @pytest.mark.asyncio
-    async def test_get_email_count(self, email_client):
+    async def test_get_email_count(self, email_client, mock_imap):
         """Test getting email count."""
         # Mock IMAP client
-        mock_imap = AsyncMock()
-        mock_imap._client_task = asyncio.Future()
-        mock_imap._client_task.set_result(None)
-        mock_imap.wait_hello_from_server = AsyncMock()
-        mock_imap.login = AsyncMock()
-        mock_imap.select = AsyncMock()
         mock_imap.search = AsyncMock(return_value=(None, [b"1 2 3 4 5"]))
         mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2 3 4 5"]))
-        mock_imap.logout = AsyncMock()
 
         # Mock IMAP class
         with patch.object(email_client, "imap_class", return_value=mock_imap):
@@ -289,7 +821,124 @@ This is the email body."""
             )
             mock_imap.select.assert_called_once_with("INBOX")
             mock_imap.uid_search.assert_called_once_with("ALL")
-            mock_imap.logout.assert_called_once()
+            mock_imap.logout.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_email_count_esearch(self, email_client, mock_imap):
+        """Test that servers with ESEARCH only return the number of matches."""
+        mock_imap.timeout = 10
+        mock_imap.protocol.capabilities = {"IMAP4REV1", "ESEARCH"}
+        mock_imap.protocol.loop = asyncio.get_running_loop()
+        mock_imap.protocol.new_tag = MagicMock(return_value="A1")
+        mock_imap.protocol.execute = AsyncMock(
+            return_value=Response("OK", [b'(TAG "A1") UID COUNT 4200', b"Search completed."])
+        )
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            assert await email_client.get_email_count(is_unread=True) == 4200
+
+        command = mock_imap.protocol.execute.call_args.args[0]
+        assert command.args == ("RETURN", "(COUNT)", "CHARSET", "utf-8", "UNSEEN")
+        mock_imap.uid_search.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connection_reused_across_clients(self, email_server, mock_imap):
+        """Test that clients for the same account share one authenticated session."""
+        mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2"]))
+
+        with patch("aioimaplib.IMAP4_SSL", return_value=mock_imap) as imap_class:
+            assert await EmailClient(email_server).get_email_count() == 2
+            assert await EmailClient(email_server).get_email_count() == 2
+
+        imap_class.assert_called_once_with(email_server.host, email_server.port)
+        mock_imap.login.assert_called_once()
+        assert mock_imap.uid_search.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_connection_pool_follows_settings(self, email_server, make_mock_imap):
+        """Test that a changed password gets new sessions and the old ones are logged out."""
+        connections = []
+
+        def connect(host, port):
+            mock_imap = make_mock_imap()
+            mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2"]))
+            connections.append(mock_imap)
+            return mock_imap
+
+        with patch("aioimaplib.IMAP4_SSL", side_effect=connect):
+            assert await EmailClient(email_server).get_email_count() == 2
+            changed_server = email_server.model_copy(update={"password": "new_password"})
+            assert await EmailClient(changed_server).get_email_count() == 2
+
+        assert len(connections) == 2
+        connections[0].login.assert_called_once_with("test_user", "test_password")
+        connections[0].logout.assert_called_once()
+        connections[1].login.assert_called_once_with("test_user", "new_password")
+        connections[1].logout.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connection_pool_replaced_once(self, email_server, make_mock_imap):
+        """Test that concurrent calls after a password change share one new pool."""
+        connections = []
+
+        async def logout():
+            # Closing the old pool takes a while
+            await asyncio.sleep(0.01)
+
+        def connect(host, port):
+            mock_imap = make_mock_imap()
+            mock_imap.uid_search = AsyncMock(return_value=(None, [b"1 2"]))
+            mock_imap.logout = AsyncMock(side_effect=logout)
+            connections.append(mock_imap)
+            return mock_imap
+
+        with patch("aioimaplib.IMAP4_SSL", side_effect=connect):
+            with patch.object(classic, "EmailConnectionPool", wraps=EmailConnectionPool) as pool_class:
+                assert await EmailClient(email_server).get_email_count() == 2
+                changed_server = email_server.model_copy(update={"password": "new_password"})
+                counts = await asyncio.gather(
+                    EmailClient(changed_server).get_email_count(), EmailClient(changed_server).get_email_count()
+                )
+
+        assert counts == [2, 2]
+        assert pool_class.call_count == 2
+        assert all(imap.login.call_args.args[1] == "new_password" for imap in connections[1:])
+
+    @pytest.mark.asyncio
+    async def test_idle_connection_keepalive(self, email_client, mock_imap):
+        """Test that idle sessions get a periodic NOOP."""
+        mock_imap.uid_search = AsyncMock(return_value=(None, [b"1"]))
+
+        with patch.object(email_client, "imap_class", return_value=mock_imap):
+            with patch.object(EmailConnectionPool, "KEEPALIVE_INTERVAL", 0):
+                await email_client.get_email_count()
+                await asyncio.sleep(0.01)
+
+        mock_imap.noop.assert_called()
+        mock_imap.logout.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connection_reconnects_after_error(self, email_client, make_mock_imap):
+        """Test that a broken or dropped session is replaced on the next call."""
+        broken_imap, lost_imap, new_imap = make_mock_imap(), make_mock_imap(), make_mock_imap()
+        for mock_imap in (broken_imap, lost_imap, new_imap):
+            mock_imap.uid_search = AsyncMock(return_value=(None, [b"1"]))
+        broken_imap.uid_search = AsyncMock(side_effect=TimeoutError)
+
+        with patch.object(email_client, "imap_class", side_effect=[broken_imap, lost_imap, new_imap]):
+            with pytest.raises(TimeoutError):
+                await email_client.get_email_count()
+            # Without LOGOUT, which would wait for the interrupted command
+            broken_imap.protocol.transport.close.assert_called_once()
+            broken_imap.logout.assert_not_called()
+
+            assert await email_client.get_email_count() == 1
+            # The server closes the idle connection
+            lost_imap.protocol.conn_lost_cb(None)
+
+            assert await email_client.get_email_count() == 1
+            lost_imap.logout.assert_not_called()
+            new_imap.uid_search.assert_called_once_with("ALL")
 
     @pytest.mark.asyncio
     async def test_send_email(self, email_client):
@@ -331,3 +980,72 @@ This is the email body."""
             assert "recipient@example.com" in recipients
             assert "cc@example.com" in recipients
             assert "bcc@example.com" in recipients
+
+    @pytest.mark.asyncio
+    async def test_send_email_reuses_connection(self, email_client):
+        """Test that consecutive sends share one authenticated SMTP connection."""
+        mock_smtp = AsyncMock()
+        mock_smtp.close = MagicMock()
+
+        with patch("aiosmtplib.SMTP", return_value=mock_smtp) as smtp_class:
+            await email_client.send_email(recipients=["one@example.com"], subject="One", body="Body")
+            await email_client.send_email(recipients=["two@example.com"], subject="Two", body="Body")
+
+        smtp_class.assert_called_once()
+        mock_smtp.connect.assert_called_once()
+        mock_smtp.login.assert_called_once()
+        mock_smtp.noop.assert_called_once_with(timeout=SMTP_NOOP_TIMEOUT)
+        assert mock_smtp.send_message.call_count == 2
+
+        await close_connection_pools()
+        mock_smtp.quit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_send_email_reconnects_after_disconnect(self, email_client):
+        """Test that an idle SMTP connection the server has dropped is replaced."""
+        stale_smtp = AsyncMock()
+        stale_smtp.close = MagicMock()
+        stale_smtp.noop.side_effect = aiosmtplib.SMTPServerDisconnected("Connection lost")
+        fresh_smtp = AsyncMock()
+
+        with patch("aiosmtplib.SMTP", side_effect=[stale_smtp, fresh_smtp]):
+            await email_client.send_email(recipients=["one@example.com"], subject="One", body="Body")
+            await email_client.send_email(recipients=["two@example.com"], subject="Two", body="Body")
+
+        stale_smtp.send_message.assert_called_once()
+        stale_smtp.close.assert_called_once()
+        fresh_smtp.login.assert_called_once()
+        fresh_smtp.send_message.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_send_email_drops_old_idle_connection(self, email_client):
+        """Test that an SMTP connection idle for too long is closed without waiting on a NOOP."""
+        old_smtp = AsyncMock()
+        old_smtp.close = MagicMock()
+        fresh_smtp = AsyncMock()
+
+        with patch("aiosmtplib.SMTP", side_effect=[old_smtp, fresh_smtp]):
+            await email_client.send_email(recipients=["one@example.com"], subject="One", body="Body")
+            with patch("time.monotonic", return_value=time.monotonic() + SMTP_IDLE_TIMEOUT + 1):
+                await email_client.send_email(recipients=["two@example.com"], subject="Two", body="Body")
+
+        old_smtp.noop.assert_not_called()
+        old_smtp.close.assert_called_once()
+        fresh_smtp.send_message.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_send_email_connection_follows_settings(self, email_client):
+        """Test that a changed password gets a new SMTP connection and the old one is closed."""
+        old_smtp = AsyncMock()
+        old_smtp.close = MagicMock()
+        new_smtp = AsyncMock()
+
+        with patch("aiosmtplib.SMTP", side_effect=[old_smtp, new_smtp]):
+            await email_client.send_email(recipients=["one@example.com"], subject="One", body="Body")
+            changed_server = email_client.email_server.model_copy(update={"password": "new_password"})
+            await EmailClient(changed_server).send_email(recipients=["two@example.com"], subject="Two", body="Body")
+
+        old_smtp.noop.assert_not_called()
+        old_smtp.close.assert_called_once()
+        new_smtp.login.assert_called_once_with("test_user", "new_password")
+        new_smtp.send_message.assert_called_once()
@@ -5,7 +5,10 @@ import pytest
 
 from mcp_email_server.app import (
     add_email_account,
+    lifespan,
     list_available_accounts,
+    list_emails,
+    mcp,
     page_email,
     send_email,
 )
@@ -164,6 +167,48 @@ class TestMcpTools:
                 is_flagged=None,
             )
 
+    @pytest.mark.asyncio
+    async def test_list_emails(self):
+        """Test list_emails MCP tool."""
+        now = datetime.now()
+        email_page = EmailPageResponse(
+            page=1,
+            page_size=10,
+            before=None,
+            since=None,
+            subject=None,
+            body=None,
+            text=None,
+            emails=[EmailData(subject="Test Subject", sender="sender@example.com", body="", date=now, attachments=[])],
+            total=1,
+            headers_only=True,
+        )
+
+        mock_handler = AsyncMock()
+        mock_handler.get_emails.return_value = email_page
+
+        with patch("mcp_email_server.app.dispatch_handler", return_value=mock_handler):
+            result = await list_emails(account_name="test_account", is_unread=True)
+
+            assert result == email_page
+
+            # Bodies are not fetched for listings
+            mock_handler.get_emails.assert_called_once_with(
+                page=1,
+                page_size=10,
+                before=None,
+                since=None,
+                subject=None,
+                body=None,
+                text=None,
+                from_address=None,
+                to_address=None,
+                order="desc",
+                is_unread=True,
+                is_flagged=None,
+                headers_only=True,
+            )
+
     @pytest.mark.asyncio
     async def test_send_email(self):
         """Test send_email MCP tool."""
@@ -189,3 +234,13 @@ class TestMcpTools:
                 ["cc@example.com"],
                 ["bcc@example.com"],
             )
+
+    @pytest.mark.asyncio
+    async def test_lifespan_closes_connection_pools(self):
+        """Test that connections are closed when the last session ends."""
+        with patch("mcp_email_server.app.close_connection_pools", new_callable=AsyncMock) as close_connection_pools:
+            async with lifespan(mcp):
+                async with lifespan(mcp):
+                    pass
+                close_connection_pools.assert_not_called()
+            close_connection_pools.assert_called_once()
@@ -1,5 +1,7 @@
 from datetime import datetime
+from unittest.mock import MagicMock
 
+from mcp_email_server.emails.classic import EmailClient
 from mcp_email_server.emails.models import EmailData, EmailPageResponse
 
 
@@ -26,7 +28,7 @@ class TestEmailData:
         assert email_data.is_deleted is False
         assert email_data.is_draft is False
         assert email_data.is_recent is False
-        assert email_data.flags == []
+        assert email_data.flags == ()
 
     def test_from_email(self):
         """Test from_email class method."""
@@ -53,7 +55,7 @@ class TestEmailData:
         assert email_data.is_deleted is False
         assert email_data.is_draft is False
         assert email_data.is_recent is False
-        assert email_data.flags == []
+        assert email_data.flags == ()
 
     def test_from_email_with_flags(self):
         """Test from_email with flag data."""
@@ -81,7 +83,77 @@ class TestEmailData:
         assert email_data.is_deleted is False
         assert email_data.is_draft is False
         assert email_data.is_recent is True
-        assert email_data.flags == ["\\Seen", "\\Answered", "\\Recent"]
+        assert email_data.flags == ("\\Seen", "\\Answered", "\\Recent")
+
+    def test_from_email_parsed(self):
+        """Test from_email with an email parsed by EmailClient."""
+        raw_email = (
+            b"From: =?utf-8?q?Caf=C3=A9?= <sender@example.com>\r\n"
+            b"Subject: Test Subject\r\n"
+            b"Date: Mon, 1 Jan 2024 00:00:00 +0000\r\n"
+            b"\r\n"
+            b"Test Body"
+        )
+        email_dict = EmailClient(MagicMock())._parse_email_data(raw_email)
+
+        email_data = EmailData.from_email(email_dict)
+
+        assert type(email_data.subject) is str
+        assert type(email_data.sender) is str
+        assert email_data.sender == "Caf\u00e9 <sender@example.com>"
+        assert email_data == EmailData.model_validate(email_data.model_dump())
+        assert '"subject":"Test Subject"' in email_data.model_dump_json()
+
+    def test_flags_tuple(self):
+        """Test that raw flags are stored as a tuple and serialized as a list."""
+        email_data = EmailData(
+            subject="Test Subject",
+            sender="test@example.com",
+            body="Test Body",
+            date=datetime.now(),
+            attachments=[],
+            is_read=True,
+            is_draft=True,
+            flags=["\\Seen", "\\Draft", "$Forwarded"],
+        )
+
+        assert email_data.flags == ("\\Seen", "\\Draft", "$Forwarded")
+        assert '"flags":["\\\\Seen","\\\\Draft","$Forwarded"]' in email_data.model_dump_json()
+
+    def test_flag_fields_round_trip(self):
+        """Test that is_* are accepted as input and survive a dump and validate round trip."""
+        email_data = EmailData(
+            subject="Test Subject",
+            sender="test@example.com",
+            body="Test Body",
+            date=datetime.now(),
+            attachments=[],
+            is_read=True,
+            is_flagged=True,
+            flags=["\\Seen", "\\Flagged"],
+        )
+
+        assert email_data.is_read is True
+        assert email_data.is_flagged is True
+        assert email_data.is_answered is False
+        assert EmailData.model_validate(email_data.model_dump()) == email_data
+        assert EmailData.model_validate_json(email_data.model_dump_json()) == email_data
+
+        email_data.is_flagged = False
+        assert email_data.is_flagged is False
+        assert email_data.model_copy(update={"is_read": False}).is_read is False
+
+        # from_email takes the is_* keys of the dict, not its raw flags
+        email_dict = {**email_data.model_dump(), "from": "test@example.com", "is_read": False}
+        from_email = EmailData.from_email(email_dict)
+        assert from_email.is_read is False
+        assert from_email.is_flagged is False
+
+    def test_json_schema(self):
+        """Test that the schema shows the is_* fields."""
+        properties = EmailData.model_json_schema()["properties"]
+
+        assert {"is_read", "is_answered", "is_flagged", "is_deleted", "is_draft", "is_recent"} <= properties.keys()
 
 
 class TestEmailPageResponse: